@@ -0,0 +1,226 @@
+"""
+Performance regression benchmarks for the lift data and render pipeline.
+
+Times get_lift_data, the reason classifier, assign_village (per row) and
+assign_villages (per distinct name), format_display_df, the paginated hold table
+and get_noaa_hourly_wind on synthetic lift sheets (1k to 1M rows) and a sample
+NOAA hourly payload, records peak memory for each stage, and compares both
+against benchmarks/baseline.json.
+Runs fully offline: the Google Sheet and the NOAA HTTP call are stubbed.
+
+Usage:
+    python benchmarks/bench_pipeline.py                  # compare against the baseline
+    python benchmarks/bench_pipeline.py --save-baseline  # record a new baseline
+    python benchmarks/bench_pipeline.py --sizes 1000,10000 --threshold 0.5
+
+Exits with status 1 if any stage is slower or uses more memory than the baseline
+by more than the threshold, or if there is no baseline to compare against (pass
+--allow-missing-baseline to just print the results in that case).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import hold_table  # noqa: E402
+import lift_display  # noqa: E402
+import lift_roster  # noqa: E402
+import merge_lift_wind_data  # noqa: E402
+import reason_classifier  # noqa: E402
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+NOAA_PAYLOAD_PATH = os.path.join(BENCH_DIR, "noaa_hourly_forecast.json")
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Regressions smaller than this are timer noise, whatever the ratio
+MIN_SECONDS_DELTA = 0.005
+
+# Synthetic sheet mix, roughly what a season's worth of 10.60 entries looks like
+CATEGORIES = ["Hold", "Reduced/Adjust Speed", "Delayed Opening", "Closed", "Other"]
+CATEGORY_WEIGHTS = [0.45, 0.25, 0.12, 0.10, 0.08]
+REASONS = ["High wind", "Wind", "Wind gusts", "Mechanical issue", "Power outage",
+           "Icing on haul rope", "Patrol hold - avalanche control", "Medical", "Evacuation drill"]
+REASON_WEIGHTS = [0.30, 0.15, 0.08, 0.17, 0.07, 0.08, 0.08, 0.05, 0.02]
+FAULTS = ["Wind > 35mph", "Wind > 30mph", "Wind 20-25mph", "Wind > 40mph", "Drive fault",
+          "Brake fault", "Comms fault", "Rope ice", ""]
+UNKNOWN_LIFTS = ["McConkeys", "Red Pine", "Peak5", "Test Lift"]
+DAYS_OF_HISTORY = 60
+RESOLVED_FRACTION = 0.6
+
+
+class SyntheticSheet:
+    """Stands in for the gspread worksheet, returning pre-built records"""
+
+    def __init__(self, records):
+        self.records = records
+
+    def get_all_records(self):
+        return self.records
+
+
+class RecordedResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+def make_sheet_records(n_rows, seed=0):
+    """Build n_rows of sheet records spread over the season, with about 1/60 of them from today"""
+    rng = np.random.default_rng(seed)
+    lifts = lift_roster.get_roster().names() + UNKNOWN_LIFTS
+
+    today = datetime.combine(datetime.today().date(), datetime.min.time())
+    day_offsets = rng.integers(0, DAYS_OF_HISTORY, n_rows)
+    # Operating day is roughly 8am to 4pm
+    second_offsets = rng.integers(8 * 3600, 16 * 3600, n_rows)
+    starts = (pd.Timestamp(today) - pd.to_timedelta(day_offsets, unit="D")
+              + pd.to_timedelta(second_offsets, unit="s"))
+    resolved = rng.random(n_rows) < RESOLVED_FRACTION
+    resolved_at = starts + pd.to_timedelta(rng.integers(300, 4 * 3600, n_rows), unit="s")
+
+    df = pd.DataFrame({
+        "Lift": rng.choice(lifts, n_rows),
+        "MEOW Category": rng.choice(CATEGORIES, n_rows, p=CATEGORY_WEIGHTS),
+        "MEOW Reasoning": rng.choice(REASONS, n_rows, p=REASON_WEIGHTS),
+        "10.60 TIME": starts.strftime("%Y-%m-%d %H:%M:%S"),
+        "10.63": np.where(resolved, resolved_at.strftime("%Y-%m-%d %H:%M:%S"), ""),
+        "Fault": rng.choice(FAULTS, n_rows),
+    })
+    return df.to_dict("records")
+
+
+def measure(fn, repeat):
+    """Best wall time over `repeat` runs, plus peak traced memory (MB) from one extra run"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(best, 6), "peak_mb": round(peak / 2**20, 3)}
+
+
+def run_benchmarks(sizes, repeat):
+    # Keep the pipeline quiet and offline (lift_roster imported debug_log by name)
+    for module in (merge_lift_wind_data, lift_roster):
+        module.debug_log = lambda message: None
+    with open(NOAA_PAYLOAD_PATH) as f:
+        noaa_payload = json.load(f)
+    lift_display.requests.get = lambda url, *args, **kwargs: RecordedResponse(noaa_payload)
+
+    results = {}
+    for n_rows in sizes:
+        records = make_sheet_records(n_rows)
+        merge_lift_wind_data._sheet = SyntheticSheet(records)
+
+        # Whole-column classification, as if every row of the sheet were open today
+        sheet_df = pd.DataFrame(records)
+        results[f"classify_reasons@{n_rows}"] = measure(
+            lambda: reason_classifier.add_reason_columns(sheet_df.copy()), repeat)
+
+        results[f"get_lift_data@{n_rows}"] = measure(merge_lift_wind_data.get_lift_data, repeat)
+        all_lifts, wind_hold, other_hold, _ = merge_lift_wind_data.get_lift_data()
+
+        # Per-row lookup (comparable with older baselines) and the per-distinct-name path
+        results[f"assign_village@{n_rows}"] = measure(
+            lambda: all_lifts["Lift"].apply(lift_display.assign_village), repeat)
+        results[f"assign_villages@{n_rows}"] = measure(
+            lambda: lift_display.assign_villages(all_lifts["Lift"]), repeat)
+
+        display_df = all_lifts[["Lift", "10.60 TIME", "Duration", "Fault"]]
+        results[f"format_display_df@{n_rows}"] = measure(
+            lambda: lift_display.format_display_df(display_df), repeat)
+
+        hold_df = wind_hold.assign(Village=lift_display.assign_villages(wind_hold["Lift"]))
+        results[f"hold_table_page@{n_rows}"] = measure(
+            lambda: lift_display.format_display_df(
+                hold_table.query_hold_table(hold_df, classes=[hold_table.FEEDER, hold_table.OTHER])[0]),
+            repeat)
+
+        print(f"{n_rows:>9} rows: {len(all_lifts)} open today, {len(wind_hold)} wind holds, "
+              f"{len(other_hold)} other holds", file=sys.stderr)
+
+    results["get_noaa_hourly_wind"] = measure(
+        lambda: lift_display.get_noaa_hourly_wind("https://api.weather.gov/recorded"), repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table and return the names of stages that regressed"""
+    regressions = []
+    print(f"{'stage':<32}{'seconds':>12}{'baseline':>12}{'peak MB':>12}{'baseline':>12}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        flag = ""
+        if base:
+            slower = (result["seconds"] > base["seconds"] * (1 + threshold)
+                      and result["seconds"] - base["seconds"] > MIN_SECONDS_DELTA)
+            bigger = result["peak_mb"] > base["peak_mb"] * (1 + threshold)
+            if slower or bigger:
+                regressions.append(name)
+                flag = "  REGRESSION"
+        print(f"{name:<32}{result['seconds']:>12.4f}"
+              f"{base['seconds'] if base else float('nan'):>12.4f}"
+              f"{result['peak_mb']:>12.2f}"
+              f"{base['peak_mb'] if base else float('nan'):>12.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="comma-separated sheet sizes (rows)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown / memory growth over the baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write these results as the new baseline instead of comparing")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="exit 0 when there is no baseline file, instead of failing")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run_benchmarks(sizes, args.repeat)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first", file=sys.stderr)
+        compare(results, {}, args.threshold)
+        return 0 if args.allow_missing_baseline else 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
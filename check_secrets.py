@@ -1,5 +1,6 @@
 import streamlit as st
-import json
+
+from google_credentials import find_credentials, missing_fields
 
 # Simple Streamlit app to check secrets
 st.title("Streamlit Secrets Diagnostic")
@@ -16,59 +17,36 @@ if hasattr(st, 'secrets'):
     # Check for specific Google credentials keys
     st.subheader("Google Credentials Check")
     
-    if 'GOOGLE_CREDENTIALS' in st.secrets:
-        st.success("✅ Found 'GOOGLE_CREDENTIALS' in secrets")
+    lookup = find_credentials(st.secrets)
+    
+    if lookup.source is None:
+        st.error("❌ No Google credentials found in any format")
+    else:
+        st.success(f"✅ Found '{lookup.source}' in secrets")
         
         # Check the type and content structure (without showing private data)
-        creds = st.secrets['GOOGLE_CREDENTIALS']
-        st.write(f"Type: {type(creds)}")
-        
-        if isinstance(creds, dict):
-            # It's already a dictionary, check for required fields
+        st.write(f"Type: {type(lookup.raw)}")
+        if isinstance(lookup.raw, str):
+            st.write("Format: String (needs to be parsed as JSON)")
+        else:
             st.write("Format: JSON dictionary (correct)")
+        
+        if lookup.info is None:
+            st.error(f"❌ Failed to parse as JSON: {lookup.error}")
+        else:
+            if isinstance(lookup.raw, str):
+                st.success("✅ Successfully parsed as JSON")
             
-            required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 
-                               'client_email', 'client_id', 'auth_uri', 'token_uri']
-            
-            missing_fields = [field for field in required_fields if field not in creds]
+            missing = missing_fields(lookup.info)
             
-            if missing_fields:
-                st.error(f"❌ Missing required fields: {', '.join(missing_fields)}")
+            if missing:
+                st.error(f"❌ Missing required fields: {', '.join(missing)}")
             else:
                 st.success("✅ All required credential fields are present")
                 
                 # Show some non-sensitive fields
-                st.write(f"Service Account Email: {creds.get('client_email')}")
-                st.write(f"Project ID: {creds.get('project_id')}")
-        else:
-            # It's a string, check if it can be parsed as JSON
-            st.write(f"Format: String (needs to be parsed as JSON)")
-            try:
-                # Try to parse as JSON, just as a test
-                parsed = json.loads(str(creds))
-                st.success("✅ Successfully parsed as JSON")
-                
-                # Check for required fields
-                required_fields = ['type', 'project_id', 'private_key_id', 'private_key', 
-                                  'client_email', 'client_id', 'auth_uri', 'token_uri']
-                
-                missing_fields = [field for field in required_fields if field not in parsed]
-                
-                if missing_fields:
-                    st.error(f"❌ Missing required fields: {', '.join(missing_fields)}")
-                else:
-                    st.success("✅ All required credential fields are present")
-            except json.JSONDecodeError as e:
-                st.error(f"❌ Failed to parse as JSON: {str(e)}")
-    else:
-        st.error("❌ 'GOOGLE_CREDENTIALS' not found in secrets")
-        
-        # Check if it's in the nested format
-        if 'google' in st.secrets and 'credentials' in st.secrets.google:
-            st.success("✅ Found 'google.credentials' instead")
-            # We could do the same validation here
-        else:
-            st.error("❌ No Google credentials found in any format")
+                st.write(f"Service Account Email: {lookup.info.get('client_email')}")
+                st.write(f"Project ID: {lookup.info.get('project_id')}")
     
     # Check for sheet name
     st.subheader("Google Sheet Name Check")
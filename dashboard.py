@@ -1,7 +1,9 @@
 import streamlit as st
-import pandas as pd
-import requests
-from merge_lift_wind_data import get_lift_data  # Your function that fetches & filters lift data
+from merge_lift_wind_data import LiftDataError, empty_lift_data, get_lift_data  # Your function that fetches & filters lift data
+from lift_snapshot import load_snapshot
+from lift_display import assign_villages, format_noaa_df, get_noaa_hourly_wind
+from hold_table import render_hold_table
+from hold_kpis import REASON, VILLAGE, VILLAGE_REASON, HoldKpiAggregator
 from streamlit_autorefresh import st_autorefresh
 
 # Set the page layout to wide (must be the first Streamlit command)
@@ -64,58 +66,6 @@ with st.sidebar:
     st.title("Debug Info")
     show_debug = st.checkbox("Show Debug Info", value=True)
 
-# ----------------------------
-# NOAA Wind Forecast Function (with gusts and trend)
-def get_noaa_hourly_wind(url, num_hours=5):
-    """
-    Fetch the next num_hours of hourly wind forecast data from a NOAA grid point.
-    Returns a tuple: (DataFrame with Hour, Wind Speed (mph), Wind Gust (mph), Wind Direction) and a trend string.
-    """
-    response = requests.get(url).json()
-    periods = response["properties"]["periods"]
-    wind_data = []
-    for period in periods[:num_hours]:
-        # Format time to show only the hour and minute (assumes forecast is for today)
-        dt = pd.to_datetime(period["startTime"])
-        hour_str = dt.strftime('%I:%M %p')  # e.g., "08:00 AM"
-        
-        # Extract and convert wind speed (assumes format like "5 mph")
-        wind_speed_str = period.get("windSpeed", "")
-        try:
-            wind_speed = int(wind_speed_str.split()[0])
-        except:
-            wind_speed = None
-        
-        # Extract and convert wind gust (if available)
-        wind_gust_str = period.get("windGust", "")
-        try:
-            wind_gust = int(wind_gust_str.split()[0])
-        except:
-            wind_gust = None
-
-        wind_direction = period.get("windDirection", "N/A")
-        
-        wind_data.append({
-            "Hour": hour_str,
-            "Wind Speed (mph)": wind_speed,
-            "Wind Gust (mph)": wind_gust,
-            "Wind Direction": wind_direction
-        })
-    
-    # Determine overall trend based on first and third period wind speed (if available)
-    if len(wind_data) >= 3 and wind_data[0]["Wind Speed (mph)"] is not None and wind_data[2]["Wind Speed (mph)"] is not None:
-        diff = wind_data[2]["Wind Speed (mph)"] - wind_data[0]["Wind Speed (mph)"]
-        if diff > 0.5:
-            trend = "Increasing"
-        elif diff < -0.5:
-            trend = "Decreasing"
-        else:
-            trend = "No Change"
-    else:
-        trend = "N/A"
-    
-    return pd.DataFrame(wind_data), trend
-
 # ----------------------------
 # Define NOAA grid point endpoints for each side of the resort
 noaa_grid_points = {
@@ -123,78 +73,9 @@ noaa_grid_points = {
     "CV Wind Forecast": "https://api.weather.gov/gridpoints/SLC/111,170/forecast/hourly",
 }
 
-# ----------------------------
-# Define lists for Village assignments (update these lists with your actual lift names)
-mountain_village_lifts = [
-    "First Time", "Town", "Payday", "Crescent", "3 Kings", "Bonanza", "Silverlode",
-    "Motherlode", "King Con", "Eagle", "Eaglet", "Silver Star", "McConkey's",
-    "Pioneer", "Thaynes", "Jupiter", "Little Miners", "Mine Cart", "Tommy Knocker", "Mule Train"
-]
-canyons_village_lifts  = [
-    "Cabriolet", "Frostwood", "Sunrise", "Red Pine Gondola", "Orange Bubble", "Saddleback",
-    "High Meadow", "Short Cut", "Sun Peak", "Condor", "9990", "Peak 5", "Tombstone",
-    "Iron Mountain", "Timberline", "Flat Iron", "Sweet Pea", "Rip Cord", "Day Break",
-    "Dreamscape", "Dreamcatcher", "Quicksilver", "Over and Out", "Silver Lining",
-    "Hang Ten", "Magic Carpet", "Ripperoo"
-]
-
-# Define the important lift lists
-feeder_lifts = ["Red Pine Gondola", "Orange Bubble", "Crescent", "Payday", "Eagle"]
-upper_mountain_lifts = ["Pioneer", "Thaynes", "McConkey's", "Jupiter"]
-
-def assign_village(lift_name):
-    if lift_name in mountain_village_lifts:
-        return "Mountain Village"
-    elif lift_name in canyons_village_lifts:
-        return "Canyons Village"
-    else:
-        return "Unknown"
-
-# Check if lift is a special category for highlighting
-def get_lift_category(lift_name):
-    if lift_name in feeder_lifts:
-        return "feeder-lift"
-    elif lift_name in upper_mountain_lifts:
-        return "upper-mountain-lift"
-    else:
-        return ""
-
-# ----------------------------
-# Helper function to format a DataFrame for display as HTML with appropriate highlighting
-def format_display_df(df):
-    df_display = df.copy()
-    
-    # Format "10.60 TIME" column to show only the time if the value exists
-    if "10.60 TIME" in df_display.columns:
-        df_display["10.60 TIME"] = df_display["10.60 TIME"].apply(
-            lambda x: x.strftime("%I:%M %p") if pd.notnull(x) else ""
-        )
-    
-    # Create DataFrame HTML with row-based styling
-    html = '<table border="1" class="dataframe">'
-    
-    # Add header
-    html += '<thead><tr>'
-    for col in df_display.columns:
-        html += f'<th>{col}</th>'
-    html += '</tr></thead>'
-    
-    # Add body with conditional styling
-    html += '<tbody>'
-    for _, row in df_display.iterrows():
-        lift_name = row['Lift']
-        category_class = get_lift_category(lift_name)
-        html += f'<tr class="{category_class}">'
-        for col in df_display.columns:
-            html += f'<td>{row[col]}</td>'
-        html += '</tr>'
-    html += '</tbody></table>'
-    
-    return html
-
-# Helper function to format NOAA wind forecast DataFrame as HTML
-def format_noaa_df(df):
-    return df.to_html(index=False)
+def get_noaa_forecasts():
+    """Fetch the wind forecast and trend for every grid point, keyed by grid point name."""
+    return {name: get_noaa_hourly_wind(url) for name, url in noaa_grid_points.items()}
 
 # ----------------------------
 # Set up the Streamlit dashboard
@@ -211,13 +92,23 @@ if show_debug and 'debug_messages' in st.session_state:
         for msg in st.session_state.debug_messages:
             st.text(msg)
 
-# Fetch lift data (now use all returned dataframes)
-all_lifts_df, wind_hold_df, other_hold_df = get_lift_data()
+# Fetch lift data and forecasts (from the shared snapshot when LIFT_SNAPSHOT_DIR is set)
+try:
+    all_lifts_df, wind_hold_df, other_hold_df, holds_today_df, noaa_forecasts = load_snapshot(
+        get_lift_data, get_noaa_forecasts)
+    lift_data_ok = True
+except LiftDataError as e:
+    # Show the failure rather than an empty "nothing on hold" dashboard
+    st.error(f"Couldn't load lift data from the sheet: {e}")
+    all_lifts_df, wind_hold_df, other_hold_df, holds_today_df = empty_lift_data()
+    noaa_forecasts = get_noaa_forecasts()
+    lift_data_ok = False
 
 # Add a "Village" column based on the lift name to all dataframes
-all_lifts_df["Village"] = all_lifts_df["Lift"].apply(assign_village)
-wind_hold_df["Village"] = wind_hold_df["Lift"].apply(assign_village)
-other_hold_df["Village"] = other_hold_df["Lift"].apply(assign_village)
+all_lifts_df["Village"] = assign_villages(all_lifts_df["Lift"])
+wind_hold_df["Village"] = assign_villages(wind_hold_df["Lift"])
+other_hold_df["Village"] = assign_villages(other_hold_df["Lift"])
+holds_today_df["Village"] = assign_villages(holds_today_df["Lift"])
 
 # Get lifts with reduced/adjusted speed only
 reduced_speed_df = all_lifts_df[all_lifts_df["MEOW Category"] == "Reduced/Adjust Speed"]
@@ -230,6 +121,39 @@ cv_reduced = reduced_speed_df[reduced_speed_df["Village"] == "Canyons Village"]
 mv_wind_hold = wind_hold_df[wind_hold_df["Village"] == "Mountain Village"]
 cv_wind_hold = wind_hold_df[wind_hold_df["Village"] == "Canyons Village"]
 
+# ----------------------------
+# KPI strip: running hold totals for today, shared by every session in this process
+@st.cache_resource
+def get_kpi_aggregator():
+    return HoldKpiAggregator()
+
+kpis = get_kpi_aggregator()
+if lift_data_ok:
+    kpis.update(holds_today_df)
+village_reason_kpis = kpis.summary(VILLAGE_REASON)
+village_kpis = kpis.summary(VILLAGE)
+reason_kpis = kpis.summary(REASON)
+
+def wind_hours(village):
+    return village_reason_kpis.get((village, "Wind"), {}).get("total_hours", 0.0)
+
+# Longest open hold across all villages
+longest = max(village_kpis.values(), key=lambda k: k["longest_open_hours"], default=None)
+
+kpi_cols = st.columns(5)
+kpi_cols[0].metric("Lifts on hold", sum(k["open_count"] for k in village_kpis.values()))
+kpi_cols[1].metric("MV wind-hold hours today", f"{wind_hours('Mountain Village'):.1f}")
+kpi_cols[2].metric("CV wind-hold hours today", f"{wind_hours('Canyons Village'):.1f}")
+if longest and longest["longest_open_lift"]:
+    kpi_cols[3].metric("Longest open hold", f"{longest['longest_open_hours']:.1f} h", longest["longest_open_lift"],
+                       delta_color="off")
+else:
+    kpi_cols[3].metric("Longest open hold", "-")
+kpi_cols[4].metric("Holds started this hour", sum(k["starts_this_hour"] for k in reason_kpis.values()))
+
+# Columns shown in the per-village tables
+VILLAGE_TABLE_COLUMNS = ["Lift", "10.60 TIME", "Duration", "Fault"]
+
 # ----------------------------
 # Display village lift information side by side using columns
 col1, col2 = st.columns(2)
@@ -237,39 +161,31 @@ col1, col2 = st.columns(2)
 with col1:
     st.header("Mountain Village Lifts")
     st.subheader("Reduced/Adjust Speed")
-    if not mv_reduced.empty:
-        st.markdown(format_display_df(mv_reduced[["Lift", "10.60 TIME", "Duration", "Fault"]]), unsafe_allow_html=True)
-    else:
-        st.write("No Mountain Village lifts on reduced/adjust speed currently.")
+    render_hold_table(mv_reduced, "mv_reduced", VILLAGE_TABLE_COLUMNS,
+                      "No Mountain Village lifts on reduced/adjust speed currently.", filter_by_village=False)
     
     st.subheader("Hold - Wind Related")
-    if not mv_wind_hold.empty:
-        st.markdown(format_display_df(mv_wind_hold[["Lift", "10.60 TIME", "Duration", "Fault"]]), unsafe_allow_html=True)
-    else:
-        st.write("No Mountain Village lifts on wind-related hold currently.")
+    render_hold_table(mv_wind_hold, "mv_wind_hold", VILLAGE_TABLE_COLUMNS,
+                      "No Mountain Village lifts on wind-related hold currently.", filter_by_village=False)
 
 with col2:
     st.header("Canyons Village Lifts")
     st.subheader("Reduced/Adjust Speed")
-    if not cv_reduced.empty:
-        st.markdown(format_display_df(cv_reduced[["Lift", "10.60 TIME", "Duration", "Fault"]]), unsafe_allow_html=True)
-    else:
-        st.write("No Canyons Village lifts on reduced/adjust speed currently.")
+    render_hold_table(cv_reduced, "cv_reduced", VILLAGE_TABLE_COLUMNS,
+                      "No Canyons Village lifts on reduced/adjust speed currently.", filter_by_village=False)
     
     st.subheader("Hold - Wind Related")
-    if not cv_wind_hold.empty:
-        st.markdown(format_display_df(cv_wind_hold[["Lift", "10.60 TIME", "Duration", "Fault"]]), unsafe_allow_html=True)
-    else:
-        st.write("No Canyons Village lifts on wind-related hold currently.")
+    render_hold_table(cv_wind_hold, "cv_wind_hold", VILLAGE_TABLE_COLUMNS,
+                      "No Canyons Village lifts on wind-related hold currently.", filter_by_village=False)
 
 # ----------------------------
 # Display NOAA wind forecasts
 st.header("NOAA Wind Forecasts")
 cols = st.columns(len(noaa_grid_points))
-for idx, (name, url) in enumerate(noaa_grid_points.items()):
+for idx, name in enumerate(noaa_grid_points):
     with cols[idx]:
         st.subheader(name)
-        wind_df, trend = get_noaa_hourly_wind(url)
+        wind_df, trend = noaa_forecasts[name]
         # Determine trend color based on the trend value
         if trend.lower() == "increasing":
             trend_color = "#FF0000"  # Red for increasing
@@ -289,7 +205,6 @@ for idx, (name, url) in enumerate(noaa_grid_points.items()):
 # ----------------------------
 # Lifts on Hold - Other (Non-Wind Related)
 st.header("Lifts on Hold - Other")
-if not other_hold_df.empty:
-    st.markdown(format_display_df(other_hold_df[["Lift", "Village", "10.60 TIME", "Duration", "Fault", "MEOW Reasoning"]]), unsafe_allow_html=True)
-else:
-    st.write("No lifts on hold for reasons other than wind currently.")
\ No newline at end of file
+render_hold_table(other_hold_df, "other_hold",
+                  ["Lift", "Village", "10.60 TIME", "Duration", "Reason", "Fault", "MEOW Reasoning"],
+                  "No lifts on hold for reasons other than wind currently.")
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Resolve Google service-account credentials from Streamlit secrets.
+
+Shared by the dashboard data loader and the two secrets diagnostic pages, so all
+three agree on which secret layouts are supported:
+    GOOGLE_CREDENTIALS = {...} or '{...json...}'
+    [google]
+    credentials = {...} or '{...json...}'
+
+Resolved credentials are memoized per process, and the short-lived access token
+is cached on disk so a restart reuses a still-valid token instead of doing a
+fresh OAuth exchange.
+"""
+import hashlib
+import json
+import os
+from collections import namedtuple
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+
+from google.auth.transport.requests import Request
+from google.oauth2 import service_account
+
+SCOPES = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+
+REQUIRED_FIELDS = ['type', 'project_id', 'private_key_id', 'private_key',
+                   'client_email', 'client_id', 'auth_uri', 'token_uri']
+
+# Where access tokens are persisted between restarts
+TOKEN_CACHE_PATH = os.environ.get(
+    "LIFT_TOKEN_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "lift-wind-dashboard", "google_token.json"),
+)
+
+# Refresh tokens this long before they expire, rather than letting a request hit an expired one
+REFRESH_MARGIN = timedelta(minutes=5)
+
+# Result of looking for credentials in the secrets:
+#   source - which layout they were found in ("GOOGLE_CREDENTIALS", "google.credentials") or None
+#   raw    - the value as stored in the secrets
+#   info   - the parsed service-account dictionary, or None if it couldn't be parsed
+#   error  - why parsing failed, if it did
+CredentialsLookup = namedtuple("CredentialsLookup", ["source", "raw", "info", "error"])
+
+# Memoized credentials, keyed by a fingerprint of the service-account info
+_resolved = {}
+
+
+def _log_nothing(message):
+    pass
+
+
+def _parse(value):
+    """Turn a secrets value (table or JSON string) into a plain dictionary"""
+    if isinstance(value, Mapping):
+        return dict(value), None
+    try:
+        return json.loads(str(value)), None
+    except json.JSONDecodeError as e:
+        return None, str(e)
+
+
+def find_credentials(secrets):
+    """Look for service-account credentials in any supported secrets layout"""
+    if 'GOOGLE_CREDENTIALS' in secrets:
+        raw = secrets['GOOGLE_CREDENTIALS']
+        source = "GOOGLE_CREDENTIALS"
+    elif 'google' in secrets and 'credentials' in secrets['google']:
+        raw = secrets['google']['credentials']
+        source = "google.credentials"
+    else:
+        return CredentialsLookup(None, None, None, "No Google credentials found in secrets")
+
+    info, error = _parse(raw)
+    return CredentialsLookup(source, raw, info, error)
+
+
+def missing_fields(info):
+    """Required service-account fields absent from the parsed credentials"""
+    return [field for field in REQUIRED_FIELDS if field not in info]
+
+
+def _fingerprint(info):
+    return hashlib.sha256(json.dumps(info, sort_keys=True).encode()).hexdigest()
+
+
+def _token_key(creds):
+    # Don't write the service account identity to the cache file in the clear
+    key = f"{creds.service_account_email}|{creds.signer.key_id}|{' '.join(SCOPES)}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _utcnow():
+    # google-auth keeps expiry as a naive UTC datetime
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _load_token_cache():
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_token(key, creds, log):
+    cache = _load_token_cache()
+    cache[key] = {"token": creds.token, "expiry": creds.expiry.isoformat()}
+    try:
+        os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{TOKEN_CACHE_PATH}.tmp-{os.getpid()}"
+        # Owner-only: the file holds a bearer token
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, TOKEN_CACHE_PATH)
+    except OSError as e:
+        log(f"Could not write token cache: {str(e)}")
+
+
+def _restore_token(key, creds, log):
+    entry = _load_token_cache().get(key)
+    if not entry:
+        return
+    try:
+        expiry = datetime.fromisoformat(entry["expiry"])
+    except (KeyError, TypeError, ValueError):
+        return
+    if expiry - _utcnow() > REFRESH_MARGIN:
+        creds.token = entry.get("token")
+        creds.expiry = expiry
+        log(f"Reusing cached access token (expires {expiry.isoformat()} UTC)")
+
+
+def ensure_fresh_token(creds, log=_log_nothing):
+    """
+    Refresh the access token if it is missing or about to expire, and persist the new one
+    Safe to call before every batch of Sheets requests; it's a no-op while the token is fresh
+    """
+    if creds.token and creds.expiry and creds.expiry - _utcnow() > REFRESH_MARGIN:
+        return
+    try:
+        log("Refreshing Google access token...")
+        creds.refresh(Request())
+    except Exception as e:
+        # gspread will retry the refresh itself on the next request
+        log(f"Error refreshing access token: {str(e)}")
+        return
+    _save_token(_token_key(creds), creds, log)
+
+
+def resolve_credentials(secrets, log=_log_nothing):
+    """
+    Get service-account credentials from Streamlit secrets
+    Returns google-auth credentials with a valid access token, or None if none could be built
+    """
+    try:
+        log(f"Available secret keys: {list(secrets.keys())}")
+        lookup = find_credentials(secrets)
+    except Exception as e:
+        log(f"Error reading secrets: {str(e)}")
+        return None
+
+    if lookup.info is None:
+        log(f"{lookup.source or 'Credentials'}: {lookup.error}")
+        return None
+    log(f"Found credentials in {lookup.source}")
+
+    fingerprint = _fingerprint(lookup.info)
+    if fingerprint in _resolved:
+        log("Using already resolved credentials")
+        return _resolved[fingerprint]
+
+    if 'client_email' in lookup.info:
+        log(f"Service account email: {lookup.info['client_email']}")
+    try:
+        log("Creating service account credentials...")
+        creds = service_account.Credentials.from_service_account_info(lookup.info, scopes=SCOPES)
+    except Exception as e:
+        log(f"Error creating credentials: {str(e)}")
+        return None
+
+    _restore_token(_token_key(creds), creds, log)
+    ensure_fresh_token(creds, log)
+    _resolved[fingerprint] = creds
+    return creds
@@ -0,0 +1,167 @@
+"""
+Running hold KPIs for the current day.
+
+The aggregator is fed each new snapshot of today's holds, open and resolved, and
+applies only the holds that changed since the previous snapshot to running
+totals per lift, per village, per reason and per village+reason (open count,
+closed hold hours, longest open hold, hold starts per hour). Each update still
+walks today's holds once to find what changed, so a refresh costs O(holds
+today); reading the KPIs doesn't depend on how many holds there were.
+
+A hold only counts as resolved once the sheet has a "10.63" time for it. Each
+snapshot is taken as the whole day: a hold missing from it (a row that was
+deleted, or whose lift or 10.60 time was corrected) is taken back out of the
+totals. Since the snapshot includes holds resolved earlier in the day, a
+restarted process or another replica arrives at the same totals.
+"""
+import heapq
+import threading
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+LIFT = "lift"
+VILLAGE = "village"
+REASON = "reason"
+VILLAGE_REASON = "village_reason"
+
+
+class GroupTotals:
+    """Running totals for one lift, village, reason or village+reason group"""
+
+    def __init__(self):
+        self.open_count = 0
+        self.closed_count = 0
+        self.closed_hours = 0.0
+        # Sum of open hold start times (epoch seconds), so total open time is
+        # open_count * now - open_start_sum without visiting each hold
+        self.open_start_sum = 0.0
+        # (start, key) of open holds; resolved holds are dropped lazily
+        self.open_starts = []
+        self.starts_by_hour = Counter()
+
+    def open_hours(self, now):
+        return (self.open_count * now.timestamp() - self.open_start_sum) / 3600
+
+    def total_hours(self, now):
+        """Closed hold hours plus time so far on holds that are still open"""
+        return self.closed_hours + self.open_hours(now)
+
+
+class HoldKpiAggregator:
+    """Per-process hold KPIs for today, safe to share between Streamlit sessions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, day):
+        self.day = day
+        # key -> (lift, village, reason, start, resolved_at or None while open)
+        self.holds = {}
+        self.groups = defaultdict(GroupTotals)
+
+    def _groups_for(self, hold):
+        lift, village, reason = hold[:3]
+        return (
+            self.groups[(LIFT, lift)],
+            self.groups[(VILLAGE, village)],
+            self.groups[(REASON, reason)],
+            self.groups[(VILLAGE_REASON, (village, reason))],
+        )
+
+    def _apply(self, key, hold, sign):
+        """Add (sign=1) or take back (sign=-1) one hold's contribution to its groups"""
+        start, resolved_at = hold[3], hold[4]
+        start_ts = start.timestamp()
+        for group in self._groups_for(hold):
+            group.starts_by_hour[start.hour] += sign
+            if resolved_at is None:
+                group.open_count += sign
+                group.open_start_sum += sign * start_ts
+                if sign > 0:
+                    heapq.heappush(group.open_starts, (start, key))
+            else:
+                group.closed_count += sign
+                hours = max((resolved_at - start).total_seconds(), 0) / 3600
+                group.closed_hours = max(group.closed_hours + sign * hours, 0.0)
+
+    def record(self, key, hold):
+        """
+        Record the current state of one hold; a hold that was resolved and then
+        reopened (or edited) replaces its earlier state rather than counting twice
+        """
+        old = self.holds.get(key)
+        if old == hold:
+            return
+        if old is not None:
+            self._apply(key, old, -1)
+        self.holds[key] = hold
+        self._apply(key, hold, 1)
+
+    def update(self, holds_df, now=None):
+        """
+        Bring the totals up to date with today's holds
+        holds_df needs "Lift", "Village", "Reason", "10.60 TIME" and "Resolved At"
+        (NaT while open) columns, and must hold every hold logged today: holds
+        missing from it are removed from the totals
+        """
+        if now is None:
+            now = pd.Timestamp.now()
+        with self._lock:
+            if self.day != now.date():
+                self._reset(now.date())
+
+            current = {}
+            for lift, village, reason, start, resolved_at in zip(
+                    holds_df["Lift"], holds_df["Village"], holds_df["Reason"],
+                    holds_df["10.60 TIME"], holds_df["Resolved At"]):
+                if pd.isnull(start) or start.date() != self.day:
+                    continue
+                resolved_at = resolved_at if pd.notnull(resolved_at) else None
+                current[(lift, start)] = (lift, village, reason, start, resolved_at)
+
+            for key in self.holds.keys() - current.keys():
+                self._apply(key, self.holds.pop(key), -1)
+            for key, hold in current.items():
+                self.record(key, hold)
+
+    def longest_open(self, group):
+        """(lift, start) of the longest-running open hold in a group, or None"""
+        heap = group.open_starts
+        while heap:
+            key = heap[0][1]
+            hold = self.holds.get(key)
+            if hold is not None and hold[4] is None and any(g is group for g in self._groups_for(hold)):
+                break
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        start, (lift, _) = heap[0]
+        return lift, start
+
+    def summary(self, dimension, now=None):
+        """
+        KPIs for every group of one dimension (LIFT, VILLAGE, REASON or VILLAGE_REASON)
+        Returns a dict of group name -> dict of KPI values
+        """
+        if now is None:
+            now = pd.Timestamp.now()
+        with self._lock:
+            result = {}
+            for (group_dimension, name), group in self.groups.items():
+                if group_dimension != dimension or not (group.open_count or group.closed_count):
+                    # Groups whose holds were all taken back (e.g. a misspelt lift) aren't shown
+                    continue
+                longest = self.longest_open(group)
+                result[name] = {
+                    "open_count": group.open_count,
+                    "closed_count": group.closed_count,
+                    "total_hours": round(group.total_hours(now), 2),
+                    "longest_open_lift": longest[0] if longest else None,
+                    "longest_open_hours": round((now - longest[1]).total_seconds() / 3600, 2) if longest else 0.0,
+                    "starts_this_hour": group.starts_by_hour[now.hour],
+                    # Unary + drops hours whose starts were all taken back
+                    "starts_by_hour": dict(+group.starts_by_hour),
+                }
+            return result
@@ -0,0 +1,115 @@
+"""
+Paginated hold tables for the dashboard.
+
+Sorting and filtering (by village and by feeder/upper-mountain class) happen on the
+server against the current snapshot, and only the visible page of rows is rendered
+to HTML, so the payload sent to each client stays the same size however many lifts
+are on hold.
+"""
+import pandas as pd
+import streamlit as st
+
+import lift_roster
+from lift_display import format_display_df
+
+PAGE_SIZE = 15
+
+FEEDER = "Feeder"
+UPPER_MOUNTAIN = "Upper Mountain"
+OTHER = "Other"
+LIFT_CLASSES = [FEEDER, UPPER_MOUNTAIN, OTHER]
+
+# Roster class -> filter label
+CLASS_LABELS = {lift_roster.FEEDER: FEEDER, lift_roster.UPPER_MOUNTAIN: UPPER_MOUNTAIN}
+
+# Sort label -> (column, ascending)
+SORT_OPTIONS = {
+    "Longest hold first": ("Duration", False),
+    "Most recent first": ("10.60 TIME", False),
+    "Lift name": ("Lift", True),
+}
+DEFAULT_SORT = "Longest hold first"
+
+
+def lift_classes(lift_names):
+    """Feeder / Upper Mountain / Other label for each lift in a Series"""
+    roster = lift_roster.get_roster()
+    labels = {name: CLASS_LABELS.get(roster.lift_class(name), OTHER) for name in lift_names.unique()}
+    return lift_names.map(labels)
+
+
+def filter_hold_table(df, villages=None, classes=None):
+    """Rows of df in any of the given villages and lift classes (None or empty means no filter)"""
+    mask = pd.Series(True, index=df.index)
+    if villages:
+        mask &= df["Village"].isin(villages)
+    if classes:
+        mask &= lift_classes(df["Lift"]).isin(classes)
+    return df[mask]
+
+
+def page_count(total_rows, page_size=PAGE_SIZE):
+    return max(1, -(-total_rows // page_size))
+
+
+def sort_and_page(df, sort_by=DEFAULT_SORT, page=1, page_size=PAGE_SIZE):
+    """Sort df by one of SORT_OPTIONS and return the rows on the given (1-based) page"""
+    column, ascending = SORT_OPTIONS[sort_by]
+    page = min(max(page, 1), page_count(len(df), page_size))
+    start = (page - 1) * page_size
+    ordered = df.sort_values(column, ascending=ascending, na_position="last", kind="stable")
+    return ordered.iloc[start:start + page_size]
+
+
+def query_hold_table(df, villages=None, classes=None, sort_by=DEFAULT_SORT, page=1, page_size=PAGE_SIZE):
+    """
+    Filter, sort and paginate a hold table
+
+    Returns:
+        tuple: (page_df - the rows to display, total_rows - rows matching the filters)
+    """
+    filtered = filter_hold_table(df, villages, classes)
+    return sort_and_page(filtered, sort_by, page, page_size), len(filtered)
+
+
+def render_hold_table(df, key, columns, empty_message, filter_by_village=True, page_size=PAGE_SIZE):
+    """
+    Render one page of a hold table with sort/filter controls
+
+    Args:
+        df: the table's rows (with "Village" and "Duration" columns)
+        key: unique prefix for this table's widget keys
+        columns: columns to display
+        empty_message: shown instead of the table when df is empty
+        filter_by_village: offer a village filter (pointless for per-village tables)
+    """
+    if df.empty:
+        st.write(empty_message)
+        return
+
+    with st.expander("Sort & filter"):
+        villages = None
+        if filter_by_village:
+            villages = st.multiselect("Village", sorted(df["Village"].dropna().unique()), key=f"{key}_villages")
+        classes = st.multiselect("Lift type", LIFT_CLASSES, key=f"{key}_classes")
+        sort_by = st.selectbox("Sort by", list(SORT_OPTIONS), key=f"{key}_sort")
+
+    filtered = filter_hold_table(df, villages, classes)
+    if filtered.empty:
+        st.write("No lifts match the current filters.")
+        return
+
+    pages = page_count(len(filtered), page_size)
+    page = 1
+    if pages > 1:
+        # Filters may have shrunk the table since the page was picked
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key)
+
+    page_df = sort_and_page(filtered, sort_by, page, page_size)
+    st.markdown(format_display_df(page_df[columns]), unsafe_allow_html=True)
+    if pages > 1:
+        start = (page - 1) * page_size
+        st.caption(f"Showing {start + 1}–{start + len(page_df)} of {len(filtered)} lifts")
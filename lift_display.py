@@ -0,0 +1,113 @@
+"""
+Lift classification, NOAA forecast parsing and HTML formatting helpers for the dashboard.
+
+Kept out of dashboard.py (which renders the page as soon as it is imported) so the
+benchmark suite and other tools can use them directly.
+"""
+import pandas as pd
+import requests
+
+from lift_roster import get_roster
+
+# ----------------------------
+# NOAA Wind Forecast Function (with gusts and trend)
+def get_noaa_hourly_wind(url, num_hours=5):
+    """
+    Fetch the next num_hours of hourly wind forecast data from a NOAA grid point.
+    Returns a tuple: (DataFrame with Hour, Wind Speed (mph), Wind Gust (mph), Wind Direction) and a trend string.
+    """
+    response = requests.get(url).json()
+    periods = response["properties"]["periods"]
+    wind_data = []
+    for period in periods[:num_hours]:
+        # Format time to show only the hour and minute (assumes forecast is for today)
+        dt = pd.to_datetime(period["startTime"])
+        hour_str = dt.strftime('%I:%M %p')  # e.g., "08:00 AM"
+        
+        # Extract and convert wind speed (assumes format like "5 mph")
+        wind_speed_str = period.get("windSpeed", "")
+        try:
+            wind_speed = int(wind_speed_str.split()[0])
+        except:
+            wind_speed = None
+        
+        # Extract and convert wind gust (if available)
+        wind_gust_str = period.get("windGust", "")
+        try:
+            wind_gust = int(wind_gust_str.split()[0])
+        except:
+            wind_gust = None
+
+        wind_direction = period.get("windDirection", "N/A")
+        
+        wind_data.append({
+            "Hour": hour_str,
+            "Wind Speed (mph)": wind_speed,
+            "Wind Gust (mph)": wind_gust,
+            "Wind Direction": wind_direction
+        })
+    
+    # Determine overall trend based on first and third period wind speed (if available)
+    if len(wind_data) >= 3 and wind_data[0]["Wind Speed (mph)"] is not None and wind_data[2]["Wind Speed (mph)"] is not None:
+        diff = wind_data[2]["Wind Speed (mph)"] - wind_data[0]["Wind Speed (mph)"]
+        if diff > 0.5:
+            trend = "Increasing"
+        elif diff < -0.5:
+            trend = "Decreasing"
+        else:
+            trend = "No Change"
+    else:
+        trend = "N/A"
+    
+    return pd.DataFrame(wind_data), trend
+
+# ----------------------------
+# Village assignments and highlight classes come from the lift roster (lift_roster.yaml)
+def assign_village(lift_name):
+    return get_roster().village(lift_name)
+
+def assign_villages(lift_names):
+    """Village for each lift in a Series"""
+    return get_roster().villages(lift_names)
+
+# Check if lift is a special category for highlighting
+def get_lift_category(lift_name):
+    lift_class = get_roster().lift_class(lift_name)
+    return f"{lift_class}-lift" if lift_class else ""
+
+# ----------------------------
+# Helper function to format a DataFrame for display as HTML with appropriate highlighting
+def format_display_df(df):
+    df_display = df.copy()
+    
+    # Format "10.60 TIME" column to show only the time if the value exists
+    if "10.60 TIME" in df_display.columns:
+        df_display["10.60 TIME"] = df_display["10.60 TIME"].apply(
+            lambda x: x.strftime("%I:%M %p") if pd.notnull(x) else ""
+        )
+    
+    # Create DataFrame HTML with row-based styling
+    html = '<table border="1" class="dataframe">'
+    
+    # Add header
+    html += '<thead><tr>'
+    for col in df_display.columns:
+        html += f'<th>{col}</th>'
+    html += '</tr></thead>'
+    
+    # Add body with conditional styling
+    html += '<tbody>'
+    for _, row in df_display.iterrows():
+        lift_name = row['Lift']
+        category_class = get_lift_category(lift_name)
+        html += f'<tr class="{category_class}">'
+        for col in df_display.columns:
+            html += f'<td>{row[col]}</td>'
+        html += '</tr>'
+    html += '</tbody></table>'
+    
+    return html
+
+# Helper function to format NOAA wind forecast DataFrame as HTML
+def format_noaa_df(df):
+    return df.to_html(index=False)
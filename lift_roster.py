@@ -0,0 +1,168 @@
+"""
+Lift roster: village, highlight class and wind tolerance for each lift.
+
+The roster lives in lift_roster.yaml and is compiled into a frozen name -> LiftInfo
+index. The file is re-read when its modification time changes, so it can be edited
+without restarting the server. Sheet spellings are resolved exactly, then by a
+normalized key (case, punctuation, spacing and "Lift"/"Chair"/... suffixes ignored),
+then by fuzzy match; each raw name is resolved once per roster version and cached,
+and names that match nothing are reported once.
+"""
+import difflib
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+import yaml
+
+from merge_lift_wind_data import debug_log
+
+ROSTER_PATH = os.environ.get(
+    "LIFT_ROSTER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "lift_roster.yaml")
+)
+
+# How often (seconds) to stat the roster file for changes
+RELOAD_CHECK_INTERVAL = 1.0
+
+# Minimum similarity (0-1) for a fuzzy match, and how far ahead of the runner-up it must be
+FUZZY_CUTOFF = 0.85
+FUZZY_MARGIN = 0.05
+
+UNKNOWN_VILLAGE = "Unknown"
+FEEDER = "feeder"
+UPPER_MOUNTAIN = "upper-mountain"
+LIFT_CLASSES = {FEEDER, UPPER_MOUNTAIN}
+
+# Words that don't help tell lifts apart ("Red Pine" vs "Red Pine Gondola")
+IGNORED_WORDS = {"lift", "chair", "chairlift", "gondola", "express", "the"}
+
+LiftInfo = namedtuple("LiftInfo", ["name", "village", "lift_class", "tolerance"])
+
+
+def normalize_name(name):
+    """Lookup key for a lift name: lowercase letters and digits only, minus filler words"""
+    words = re.sub(r"['’`]", "", str(name).casefold())
+    words = re.findall(r"[a-z0-9]+", words)
+    significant = [word for word in words if word not in IGNORED_WORDS]
+    return "".join(significant or words)
+
+
+class Roster:
+    """Frozen lift index plus a per-raw-name resolution cache"""
+
+    def __init__(self, lifts, keys):
+        # name -> LiftInfo
+        self.lifts = MappingProxyType(dict(lifts))
+        # normalized name or alias -> LiftInfo
+        self._by_key = MappingProxyType(dict(keys))
+        self._resolved = {}
+
+    def _fuzzy_match(self, key):
+        scores = sorted(
+            ((difflib.SequenceMatcher(None, key, candidate).ratio(), candidate) for candidate in self._by_key),
+            reverse=True,
+        )
+        if not scores or scores[0][0] < FUZZY_CUTOFF:
+            return None
+        if len(scores) > 1 and scores[0][0] - scores[1][0] < FUZZY_MARGIN:
+            # Too close to call between two lifts
+            return None
+        return self._by_key[scores[0][1]]
+
+    def resolve(self, raw_name):
+        """LiftInfo for a lift name as spelled in the sheet, or None if it matches nothing"""
+        try:
+            return self._resolved[raw_name]
+        except KeyError:
+            pass
+
+        info = self.lifts.get(raw_name)
+        if info is None:
+            key = normalize_name(raw_name)
+            info = self._by_key.get(key) or self._fuzzy_match(key)
+            if info is None:
+                debug_log(f"Lift '{raw_name}' is not in the lift roster; showing it as {UNKNOWN_VILLAGE}")
+            else:
+                debug_log(f"Matched lift '{raw_name}' to '{info.name}'")
+        self._resolved[raw_name] = info
+        return info
+
+    def villages(self, lift_names):
+        """Village for each lift in a Series (resolving each distinct name once)"""
+        return lift_names.map({name: self.village(name) for name in lift_names.unique()})
+
+    def village(self, lift_name):
+        info = self.resolve(lift_name)
+        return info.village if info else UNKNOWN_VILLAGE
+
+    def lift_class(self, lift_name):
+        info = self.resolve(lift_name)
+        return info.lift_class if info else None
+
+    def names(self, village=None):
+        return [info.name for info in self.lifts.values() if village is None or info.village == village]
+
+
+def compile_roster(config):
+    """Build a Roster from the parsed YAML (see lift_roster.yaml for the format)"""
+    lifts = {}
+    keys = {}
+    for village, village_lifts in (config.get("villages") or {}).items():
+        for name, settings in (village_lifts or {}).items():
+            name = str(name)
+            settings = settings or {}
+            lift_class = settings.get("class")
+            if lift_class is not None and lift_class not in LIFT_CLASSES:
+                raise ValueError(f"Lift '{name}' has unknown class '{lift_class}'")
+            if name in lifts:
+                raise ValueError(f"Lift '{name}' is listed more than once")
+            info = LiftInfo(name, village, lift_class, settings.get("tolerance"))
+            lifts[name] = info
+            for spelling in [name] + [str(alias) for alias in settings.get("aliases") or []]:
+                key = normalize_name(spelling)
+                if keys.get(key, info) != info:
+                    raise ValueError(f"'{spelling}' could be '{keys[key].name}' or '{name}'")
+                keys[key] = info
+    return Roster(lifts, keys)
+
+
+def load_roster(path=ROSTER_PATH):
+    with open(path) as f:
+        return compile_roster(yaml.safe_load(f) or {})
+
+
+_state = {"roster": None, "mtime": None, "checked_at": 0.0}
+_lock = threading.Lock()
+
+
+def get_roster():
+    """The current roster, reloaded if lift_roster.yaml changed since it was last read"""
+    now = time.monotonic()
+    if _state["roster"] is not None and now - _state["checked_at"] < RELOAD_CHECK_INTERVAL:
+        return _state["roster"]
+
+    with _lock:
+        _state["checked_at"] = now
+        try:
+            mtime = os.stat(ROSTER_PATH).st_mtime_ns
+        except OSError as e:
+            if _state["roster"] is None:
+                raise
+            debug_log(f"Can't check lift roster, keeping the loaded one: {str(e)}")
+            return _state["roster"]
+
+        if mtime != _state["mtime"]:
+            # Recorded up front so a broken file is reported once, not on every check
+            _state["mtime"] = mtime
+            try:
+                _state["roster"] = load_roster(ROSTER_PATH)
+                debug_log(f"Loaded lift roster ({len(_state['roster'].lifts)} lifts)")
+            except (OSError, yaml.YAMLError, ValueError) as e:
+                if _state["roster"] is None:
+                    raise
+                # Keep serving the previous roster until the file is fixed
+                debug_log(f"Error reloading lift roster, keeping the previous one: {str(e)}")
+        return _state["roster"]
@@ -0,0 +1,278 @@
+"""
+Shared lift/forecast snapshot for running several Streamlit replicas.
+
+One replica at a time (whichever holds the publish lock) fetches lift data
+from Google Sheets and the NOAA forecasts, and writes them as Arrow IPC files
+into LIFT_SNAPSHOT_DIR. Every replica memory-maps those files and only re-reads
+them when the sequence number in the small header file changes, so adding
+replicas adds no upstream calls. Each replica does keep its own pandas copy of
+the snapshot, converted once per version and shared by all of its sessions.
+
+Without LIFT_SNAPSHOT_DIR set, data is fetched in-process exactly as before.
+"""
+import fcntl
+import glob
+import json
+import os
+import struct
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from merge_lift_wind_data import LiftDataError, debug_log, hold_duration_hours
+
+# Directory shared by all replicas (e.g. a tmpfs mount); unset disables sharing
+SNAPSHOT_DIR = os.environ.get("LIFT_SNAPSHOT_DIR")
+
+# Republish once the snapshot is older than this (matches the dashboard auto-refresh)
+MAX_AGE_SECONDS = float(os.environ.get("LIFT_SNAPSHOT_MAX_AGE", "30"))
+
+# Header file: magic, sequence number, publish time (epoch seconds).
+# It is swapped in with an atomic rename once a version's data files are complete.
+HEADER_NAME = "snapshot.hdr"
+HEADER_FORMAT = "<8sQd"
+HEADER_MAGIC = b"LIFTSNAP"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+LOCK_NAME = "snapshot.lock"
+
+# Previous versions stay on disk briefly so a replica that just read the old
+# header can still open its files
+KEEP_VERSIONS = 2
+
+# Column used to record which lifts are wind/other holds inside the lifts file
+HOLD_GROUP_COLUMN = "__hold_group"
+
+NUMERIC_INFERRED_TYPES = {"integer", "floating", "mixed-integer-float", "boolean"}
+
+# The version this process currently has mapped
+_loaded = {"seq": None, "data": None}
+
+
+def _lifts_path(directory, seq):
+    return os.path.join(directory, f"lifts-{seq}.arrow")
+
+
+def _holds_path(directory, seq):
+    return os.path.join(directory, f"holds-{seq}.arrow")
+
+
+def _forecast_path(directory, seq):
+    return os.path.join(directory, f"forecast-{seq}.arrow")
+
+
+def read_header(directory):
+    """
+    Read the snapshot header
+    Returns (sequence number, publish time) or None if nothing is published yet
+    """
+    try:
+        with open(os.path.join(directory, HEADER_NAME), "rb") as f:
+            raw = f.read(HEADER_SIZE)
+    except FileNotFoundError:
+        return None
+    if len(raw) != HEADER_SIZE:
+        return None
+    magic, seq, published_at = struct.unpack(HEADER_FORMAT, raw)
+    if magic != HEADER_MAGIC:
+        return None
+    return seq, published_at
+
+
+def _replace_atomically(path, write):
+    """Write a file via a temp file in the same directory, then rename it into place"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_table(path, table):
+    def write(f):
+        with pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+    _replace_atomically(path, write)
+
+
+def _read_table(path):
+    # Arrow reads straight from the shared mapping; to_pandas() then makes this
+    # process's copy, once per snapshot version
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all().to_pandas()
+
+
+def _to_arrow(df):
+    """Convert a DataFrame to an Arrow table, storing free-text (object) columns as strings"""
+    df = df.copy()
+    for col in df.columns:
+        # Sheet cells come back as a mix of str/int, which Arrow can't type;
+        # numeric columns that only contain None for missing values are fine as-is
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in NUMERIC_INFERRED_TYPES:
+            df[col] = df[col].astype("string")
+    return pa.Table.from_pandas(df, preserve_index=True)
+
+
+def _forecasts_to_frame(forecasts):
+    """
+    One row per grid point, with its forecast rows as JSON records so that a grid
+    point with no forecast rows, and columns of None, come back as they went in
+    """
+    return pd.DataFrame(
+        [(name, trend, json.dumps(wind_df.to_dict("records"))) for name, (wind_df, trend) in forecasts.items()],
+        columns=["Grid Point", "Trend", "Forecast"],
+    )
+
+
+def _frame_to_forecasts(frame):
+    return {
+        name: (pd.DataFrame(json.loads(records)), trend)
+        for name, trend, records in zip(frame["Grid Point"], frame["Trend"], frame["Forecast"])
+    }
+
+
+def publish_snapshot(directory, lift_data, forecasts):
+    """
+    Write a new snapshot version and make it current
+    lift_data is the (all_lifts, wind_hold, other_hold, holds_today) tuple from get_lift_data,
+    forecasts maps grid point name -> (wind DataFrame, trend string)
+    Returns the new sequence number
+    """
+    header = read_header(directory)
+    seq = header[0] + 1 if header else 1
+
+    all_lifts, wind_hold, other_hold, holds_today = lift_data
+    lifts = all_lifts.copy()
+    lifts[HOLD_GROUP_COLUMN] = None
+    lifts.loc[lifts.index.isin(wind_hold.index), HOLD_GROUP_COLUMN] = "wind"
+    lifts.loc[lifts.index.isin(other_hold.index), HOLD_GROUP_COLUMN] = "other"
+
+    _write_table(_lifts_path(directory, seq), _to_arrow(lifts))
+    _write_table(_holds_path(directory, seq), _to_arrow(holds_today))
+    _write_table(_forecast_path(directory, seq), _to_arrow(_forecasts_to_frame(forecasts)))
+
+    header_bytes = struct.pack(HEADER_FORMAT, HEADER_MAGIC, seq, time.time())
+    _replace_atomically(os.path.join(directory, HEADER_NAME), lambda f: f.write(header_bytes))
+    debug_log(f"Published lift snapshot version {seq}")
+
+    _remove_old_versions(directory, seq)
+    return seq
+
+
+def _remove_old_versions(directory, current_seq):
+    for path in glob.glob(os.path.join(directory, "*-*.arrow")):
+        try:
+            seq = int(os.path.basename(path).rsplit("-", 1)[1].split(".")[0])
+        except ValueError:
+            continue
+        if seq <= current_seq - KEEP_VERSIONS:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _read_snapshot(directory, seq):
+    lifts = _read_table(_lifts_path(directory, seq))
+    holds_today = _read_table(_holds_path(directory, seq))
+    forecast_frame = _read_table(_forecast_path(directory, seq))
+
+    hold_group = lifts.pop(HOLD_GROUP_COLUMN)
+    wind_hold = lifts[hold_group == "wind"]
+    other_hold = lifts[hold_group == "other"]
+    return lifts, wind_hold, other_hold, holds_today, _frame_to_forecasts(forecast_frame)
+
+
+def _is_stale(header, max_age):
+    return header is None or time.time() - header[1] > max_age
+
+
+def _refresh(directory, fetch_lift_data, fetch_forecasts, max_age, wait):
+    """
+    Republish the snapshot if this replica wins the publish lock
+    With wait=False a replica that loses the race simply keeps serving the current version,
+    and if the sheet can't be read the current version is kept rather than replaced
+    """
+    with open(os.path.join(directory, LOCK_NAME), "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return
+        try:
+            # Another replica may have published while we waited for the lock
+            header = read_header(directory)
+            if _is_stale(header, max_age):
+                try:
+                    lift_data = fetch_lift_data()
+                except LiftDataError:
+                    if header is None:
+                        raise
+                    debug_log(f"Keeping lift snapshot version {header[0]}, the sheet couldn't be read")
+                    return
+                publish_snapshot(directory, lift_data, fetch_forecasts())
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _with_current_duration(df):
+    # Durations in the snapshot are as of publish time, so bring them up to date.
+    # A shallow copy is enough: the dashboard only adds or replaces whole columns,
+    # which doesn't touch the cached frame's data.
+    df = df.copy(deep=False)
+    if pd.api.types.is_datetime64_any_dtype(df["10.60 TIME"]):
+        df["Duration"] = hold_duration_hours(df["10.60 TIME"])
+    return df
+
+
+def load_snapshot(fetch_lift_data, fetch_forecasts, directory=SNAPSHOT_DIR, max_age=MAX_AGE_SECONDS):
+    """
+    Get lift data and forecasts, going through the shared snapshot when one is configured
+
+    Args:
+        fetch_lift_data: callable returning (all_lifts, wind_hold, other_hold, holds_today),
+                         e.g. get_lift_data
+        fetch_forecasts: callable returning {grid point name: (wind DataFrame, trend)}
+
+    Returns:
+        tuple: (all_lifts_df, wind_hold_df, other_hold_df, holds_today_df, forecasts)
+
+    Raises:
+        LiftDataError: if the sheet can't be read and there is no snapshot to fall back on
+    """
+    if not directory:
+        return (*fetch_lift_data(), fetch_forecasts())
+
+    os.makedirs(directory, exist_ok=True)
+    header = read_header(directory)
+    if _is_stale(header, max_age):
+        # Only block on the lock if there is nothing to serve yet
+        _refresh(directory, fetch_lift_data, fetch_forecasts, max_age, wait=header is None)
+        header = read_header(directory)
+    if header is None:
+        debug_log("No lift snapshot available, fetching data in-process")
+        return (*fetch_lift_data(), fetch_forecasts())
+
+    seq = header[0]
+    if _loaded["seq"] != seq:
+        try:
+            _loaded["data"] = _read_snapshot(directory, seq)
+        except FileNotFoundError:
+            # Version was cleaned up under us; pick up whatever is current now
+            header = read_header(directory)
+            if header is None:
+                debug_log("Lift snapshot disappeared, fetching data in-process")
+                return (*fetch_lift_data(), fetch_forecasts())
+            seq = header[0]
+            _loaded["data"] = _read_snapshot(directory, seq)
+        _loaded["seq"] = seq
+        debug_log(f"Mapped lift snapshot version {seq}")
+
+    all_lifts, wind_hold, other_hold, holds_today, forecasts = _loaded["data"]
+    # Forecast frames are only rendered, never modified, so they're handed out as-is
+    return (
+        _with_current_duration(all_lifts),
+        _with_current_duration(wind_hold),
+        _with_current_duration(other_hold),
+        holds_today.copy(deep=False),
+        forecasts,
+    )
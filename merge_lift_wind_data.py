@@ -1,12 +1,13 @@
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import requests
 import pandas as pd
 from datetime import datetime
 import os
-import json
 import streamlit as st
 
+from google_credentials import ensure_fresh_token, resolve_credentials
+from reason_classifier import REASON_WIND, WIND_MAX_COLUMN, WIND_MIN_COLUMN, add_reason_columns
+
 # Debug logging to help troubleshoot Google Sheets connection issues
 def debug_log(message):
     """Print a debug message to console and also to Streamlit"""
@@ -26,74 +27,9 @@ def get_google_credentials():
     # Check if Streamlit secrets are available
     if hasattr(st, 'secrets'):
         debug_log("Streamlit secrets are available")
-        
-        # DEBUG: Print all available secrets keys (without values)
-        debug_log(f"Available secret keys: {list(st.secrets.keys())}")
-        
-        # Check for various formats of credentials
-        creds_dict = None
-        
-        # Option 1: Standard GOOGLE_CREDENTIALS
-        if 'GOOGLE_CREDENTIALS' in st.secrets:
-            debug_log("Found GOOGLE_CREDENTIALS in secrets")
-            try:
-                creds_value = st.secrets['GOOGLE_CREDENTIALS']
-                if isinstance(creds_value, dict):
-                    debug_log("GOOGLE_CREDENTIALS is a dictionary")
-                    creds_dict = creds_value
-                else:
-                    debug_log(f"GOOGLE_CREDENTIALS is a {type(creds_value)}, trying to parse as JSON")
-                    creds_dict = json.loads(str(creds_value))
-            except Exception as e:
-                debug_log(f"Error processing GOOGLE_CREDENTIALS: {str(e)}")
-        
-        # Option 2: Nested google.credentials format
-        elif 'google' in st.secrets:
-            debug_log("Found 'google' section in secrets")
-            try:
-                # Print available keys in the google section
-                google_keys = list(st.secrets.google.keys()) if hasattr(st.secrets.google, 'keys') else []
-                debug_log(f"Keys in google section: {google_keys}")
-                
-                if 'credentials' in st.secrets.google:
-                    debug_log("Found google.credentials")
-                    creds_value = st.secrets.google.credentials
-                    
-                    if isinstance(creds_value, dict):
-                        debug_log("google.credentials is a dictionary")
-                        creds_dict = creds_value
-                    else:
-                        # It might be a string, so try to parse it
-                        debug_log(f"google.credentials is a {type(creds_value)}, trying to parse")
-                        if isinstance(creds_value, str):
-                            try:
-                                creds_dict = json.loads(creds_value)
-                                debug_log("Successfully parsed google.credentials as JSON")
-                            except json.JSONDecodeError as json_err:
-                                debug_log(f"Failed to parse google.credentials as JSON: {str(json_err)}")
-                                # Show a sample of the string for debugging
-                                if len(str(creds_value)) > 20:
-                                    debug_log(f"First 20 chars: {str(creds_value)[:20]}...")
-                        else:
-                            debug_log(f"Unexpected type for google.credentials: {type(creds_value)}")
-            except Exception as e:
-                debug_log(f"Error accessing google.credentials: {str(e)}")
-        
-        # If we found credentials in any format
-        if creds_dict:
-            try:
-                # Validate the structure
-                if 'client_email' in creds_dict:
-                    debug_log(f"Service account email: {creds_dict['client_email']}")
-                
-                # Create credentials object
-                debug_log("Creating ServiceAccountCredentials...")
-                return ServiceAccountCredentials.from_json_keyfile_dict(
-                    creds_dict, 
-                    ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-                )
-            except Exception as e:
-                debug_log(f"Error creating credentials: {str(e)}")
+        creds = resolve_credentials(st.secrets, log=debug_log)
+        if creds:
+            return creds
     else:
         debug_log("No Streamlit secrets available")
     
@@ -118,57 +54,6 @@ def get_sheet_name():
     debug_log(f"No sheet name in secrets, using default: {default_name}")
     return default_name
 
-# Attempt to get Google API credentials
-debug_log("INITIALIZING: Starting Google Sheets connection process")
-creds = get_google_credentials()
-
-# Try to authorize with gspread if we have credentials
-if creds:
-    try:
-        debug_log("Authorizing with gspread...")
-        client = gspread.authorize(creds)
-        debug_log("gspread authorization successful")
-        
-        # Get the sheet name
-        SHEET_NAME = get_sheet_name()
-        
-        # Try to open the Google Sheet
-        debug_log(f"Attempting to open Google Sheet: {SHEET_NAME}")
-        try:
-            spreadsheet = client.open(SHEET_NAME)
-            debug_log(f"Successfully opened sheet: {SHEET_NAME}")
-            
-            # List available worksheets
-            worksheet_list = spreadsheet.worksheets()
-            debug_log(f"Available worksheets: {', '.join([ws.title for ws in worksheet_list])}")
-            
-            # Use the first sheet
-            sheet = spreadsheet.sheet1
-            debug_log(f"Using first worksheet: {sheet.title}")
-            
-            # Verify we can read data
-            try:
-                cell_value = sheet.acell('A1').value
-                debug_log(f"Successfully read cell A1: {cell_value}")
-            except Exception as read_error:
-                debug_log(f"Error reading cell A1: {str(read_error)}")
-                sheet = None
-        except gspread.exceptions.SpreadsheetNotFound:
-            debug_log(f"Spreadsheet '{SHEET_NAME}' not found. Check the sheet name and sharing permissions.")
-            sheet = None
-        except Exception as sheet_error:
-            debug_log(f"Error opening spreadsheet: {str(sheet_error)}")
-            sheet = None
-            
-    except Exception as auth_error:
-        debug_log(f"Error during gspread authorization: {str(auth_error)}")
-        sheet = None
-        client = None
-else:
-    debug_log("No valid credentials, cannot authorize with gspread")
-    client = None
-    sheet = None
-
 # Setup dummy sheet data for when we can't connect to the actual sheet
 class DummySheet:
     def get_all_records(self):
@@ -186,10 +71,84 @@ class DummySheet:
              "10.60 TIME": "2025-02-28 10:10:00", "10.63": "", "Fault": "Drive fault"}
         ]
 
-# If we couldn't connect to the sheet, use the dummy data
-if sheet is None:
-    debug_log("Sheet connection failed or not initialized, using DummySheet")
-    sheet = DummySheet()
+# Connect to the Google Sheet lazily, so importing this module (e.g. from a
+# replica that only reads the shared snapshot) doesn't authenticate with Google
+_sheet = None
+_creds = None
+
+def connect_sheet():
+    """
+    Authorize with gspread and open the first worksheet of the lift sheet
+    Returns the worksheet, or a DummySheet if anything along the way failed
+    """
+    global _creds
+
+    # Attempt to get Google API credentials
+    debug_log("INITIALIZING: Starting Google Sheets connection process")
+    creds = _creds = get_google_credentials()
+
+    # Try to authorize with gspread if we have credentials
+    if creds:
+        try:
+            debug_log("Authorizing with gspread...")
+            client = gspread.authorize(creds)
+            debug_log("gspread authorization successful")
+        
+            # Get the sheet name
+            SHEET_NAME = get_sheet_name()
+        
+            # Try to open the Google Sheet
+            debug_log(f"Attempting to open Google Sheet: {SHEET_NAME}")
+            try:
+                spreadsheet = client.open(SHEET_NAME)
+                debug_log(f"Successfully opened sheet: {SHEET_NAME}")
+            
+                # List available worksheets
+                worksheet_list = spreadsheet.worksheets()
+                debug_log(f"Available worksheets: {', '.join([ws.title for ws in worksheet_list])}")
+            
+                # Use the first sheet
+                sheet = spreadsheet.sheet1
+                debug_log(f"Using first worksheet: {sheet.title}")
+            
+                # Verify we can read data
+                try:
+                    cell_value = sheet.acell('A1').value
+                    debug_log(f"Successfully read cell A1: {cell_value}")
+                except Exception as read_error:
+                    debug_log(f"Error reading cell A1: {str(read_error)}")
+                    sheet = None
+            except gspread.exceptions.SpreadsheetNotFound:
+                debug_log(f"Spreadsheet '{SHEET_NAME}' not found. Check the sheet name and sharing permissions.")
+                sheet = None
+            except Exception as sheet_error:
+                debug_log(f"Error opening spreadsheet: {str(sheet_error)}")
+                sheet = None
+            
+        except Exception as auth_error:
+            debug_log(f"Error during gspread authorization: {str(auth_error)}")
+            sheet = None
+            client = None
+    else:
+        debug_log("No valid credentials, cannot authorize with gspread")
+        client = None
+        sheet = None
+
+    # If we couldn't connect to the sheet, use the dummy data
+    if sheet is None:
+        debug_log("Sheet connection failed or not initialized, using DummySheet")
+        sheet = DummySheet()
+    return sheet
+
+def get_sheet():
+    """Return the lift sheet, connecting on first use"""
+    global _sheet
+    if _sheet is None:
+        _sheet = connect_sheet()
+    elif _creds is not None:
+        # Refresh (and persist) the access token ahead of expiry rather than mid-request
+        ensure_fresh_token(_creds, debug_log)
+    return _sheet
 
 # NOAA API setup
 NOAA_URL = "https://api.weather.gov/gridpoints/SLC/112,169/forecast/hourly"
@@ -220,6 +179,40 @@ def get_noaa_hourly_wind():
             {"time": "2025-02-28T13:00:00-07:00", "wind_speed": 16, "wind_direction": "W"}
         ]
 
+def hold_duration_hours(start_times, now=None):
+    """Hours (rounded to 2 decimal places) elapsed since each "10.60 TIME" value"""
+    if now is None:
+        now = pd.Timestamp.now()
+    return ((now - start_times).dt.total_seconds() / 3600).round(2)
+
+# Columns of the lift DataFrames, used when there is nothing to show
+LIFT_COLUMNS = ["Lift", "MEOW Category", "MEOW Reasoning", "10.60 TIME", "10.63", "Fault", "Duration",
+                "Reason Class", "Reason", WIND_MIN_COLUMN, WIND_MAX_COLUMN]
+
+class LiftDataError(Exception):
+    """Raised by get_lift_data when the sheet couldn't be read or processed"""
+
+def empty_lift_data():
+    """Empty versions of the DataFrames returned by get_lift_data"""
+    empty_df = pd.DataFrame(columns=LIFT_COLUMNS)
+    return empty_df, empty_df, empty_df, pd.DataFrame(columns=LIFT_COLUMNS + ["Resolved At"])
+
+def resolution_entries(df):
+    """The "10.63" column as stripped strings; blank (or whitespace-only) means unresolved"""
+    return df["10.63"].where(df["10.63"].notna(), "").astype(str).str.strip()
+
+def resolution_times(holds):
+    """
+    When each hold was resolved, from its "10.63" entry (NaT while still open)
+    A 10.63 entry without a readable time still marks the hold as resolved; it is
+    counted as resolved when it started
+    """
+    entries = resolution_entries(holds)
+    # Time-only entries ("10:45") are put on today's date
+    resolved_at = pd.to_datetime(entries.where(entries != ""), errors="coerce", format="mixed")
+    unreadable = (entries != "") & resolved_at.isna()
+    return resolved_at.mask(unreadable, holds["10.60 TIME"])
+
 def get_lift_data():
     """
     Fetches lift status from Google Sheets and filters relevant lifts.
@@ -228,17 +221,24 @@ def get_lift_data():
         tuple: (
             all_lifts_df - DataFrame with all filtered lifts,
             wind_hold_df - DataFrame with lifts on hold due to wind,
-            other_hold_df - DataFrame with lifts on hold for other reasons
+            other_hold_df - DataFrame with lifts on hold for other reasons,
+            holds_today_df - DataFrame with every hold logged today, open or resolved,
+                             with a "Resolved At" column (NaT while open)
         )
+    
+    Raises:
+        LiftDataError: if the sheet couldn't be read or processed. Callers must not
+        treat this as "no lifts are on hold".
     """
     # Load data from the Google Sheet into a DataFrame
     try:
         debug_log("Fetching data from sheet...")
-        data = sheet.get_all_records()
+        data = get_sheet().get_all_records()
         debug_log(f"Got {len(data)} records from sheet")
         
         if len(data) == 0:
             debug_log("WARNING: Sheet returned 0 records")
+            return empty_lift_data()
         
         df = pd.DataFrame(data)
         debug_log(f"DataFrame created with columns: {', '.join(df.columns)}")
@@ -246,49 +246,58 @@ def get_lift_data():
         # Convert the "10.60 TIME" column to datetime
         df["10.60 TIME"] = pd.to_datetime(df["10.60 TIME"], errors="coerce")
 
-        # Filter for today's records, where MEOW Category is either "Reduced/Adjust Speed" or "Hold"
-        # and where "10.63" is blank (meaning they haven't been resolved yet).
+        # Today's records, resolved or not
         today = datetime.today().strftime("%Y-%m-%d")
         debug_log(f"Filtering for today's date: {today}")
-        
-        filtered_df = df[
-            (df["10.60 TIME"].dt.strftime("%Y-%m-%d") == today) &
-            (df["MEOW Category"].isin(["Reduced/Adjust Speed", "Hold"])) &
-            ((df["10.63"].isna()) | (df["10.63"] == ""))
+        todays_df = df[df["10.60 TIME"].dt.strftime("%Y-%m-%d") == today]
+
+        # Filter for records where MEOW Category is either "Reduced/Adjust Speed" or "Hold"
+        # and where "10.63" is blank (meaning they haven't been resolved yet), the same
+        # test the KPI strip's resolution_times uses.
+        filtered_df = todays_df[
+            (todays_df["MEOW Category"].isin(["Reduced/Adjust Speed", "Hold"])) &
+            (resolution_entries(todays_df) == "")
         ].copy()
         
         debug_log(f"After filtering: {len(filtered_df)} records")
 
         # Calculate the "Duration" (in hours, rounded to 2 decimal places) since the "10.60 TIME"
-        now = pd.Timestamp.now()
-        filtered_df["Duration"] = ((now - filtered_df["10.60 TIME"]).dt.total_seconds() / 3600).round(2)
+        filtered_df["Duration"] = hold_duration_hours(filtered_df["10.60 TIME"])
+
+        # Classify MEOW Reasoning and pull wind thresholds out of Fault (adds "Reason Class",
+        # "Reason", "Wind Min (mph)" and "Wind Max (mph)")
+        add_reason_columns(filtered_df)
 
         # Get only the lifts on hold (i.e. where MEOW Category is "Hold")
         holds_all = filtered_df[filtered_df["MEOW Category"] == "Hold"]
         debug_log(f"Lifts on hold: {len(holds_all)}")
 
-        # From the holds, get those where the MEOW Reasoning mentions "wind"
-        wind_hold = holds_all[holds_all["MEOW Reasoning"].str.contains("wind", case=False, na=False)]
+        # From the holds, get those whose MEOW Reasoning classifies as wind
+        wind_hold = holds_all[holds_all["Reason Class"] == REASON_WIND]
         debug_log(f"Lifts on wind hold: {len(wind_hold)}")
 
         # The "other" holds are those lifts on hold that are not wind-related
         other_hold = holds_all[~holds_all.index.isin(wind_hold.index)]
         debug_log(f"Lifts on other hold: {len(other_hold)}")
 
-        return filtered_df, wind_hold, other_hold
+        # Every hold logged today, with when it was resolved, for the running KPIs
+        holds_today = todays_df[todays_df["MEOW Category"] == "Hold"].copy()
+        holds_today["Resolved At"] = resolution_times(holds_today)
+        add_reason_columns(holds_today)
+        debug_log(f"Holds logged today: {len(holds_today)} ({holds_today['Resolved At'].notna().sum()} resolved)")
+
+        return filtered_df, wind_hold, other_hold, holds_today
     
     except Exception as e:
         debug_log(f"Error processing lift data: {str(e)}")
-        # Return empty DataFrames in case of error
-        empty_df = pd.DataFrame(columns=["Lift", "MEOW Category", "MEOW Reasoning", 
-                                         "10.60 TIME", "10.63", "Fault", "Duration"])
-        return empty_df, empty_df, empty_df
+        raise LiftDataError(str(e)) from e
 
 # For testing purposes:
 if __name__ == "__main__":
-    all_lifts, wind_hold, other_hold = get_lift_data()
+    all_lifts, wind_hold, other_hold, holds_today = get_lift_data()
     print(f"All Lifts: {len(all_lifts)}")
     print(f"Wind Hold: {len(wind_hold)}")
     print(f"Other Hold: {len(other_hold)}")
+    print(f"Holds Today: {len(holds_today)}")
     print("\nNOAA Forecast:")
     print(get_noaa_hourly_wind())
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Classify hold reasons and extract wind thresholds from the sheet's free text.
+
+"MEOW Reasoning" is mapped to a small set of integer-coded reason classes and the
+"Fault" column's wind limits ("Wind > 35mph", "Wind 20-25mph") are pulled out into
+numeric columns. Both run once per snapshot with vectorized pandas string methods
+over the distinct values only, and results are memoized per distinct string since
+the same phrases repeat all season.
+"""
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Reason class codes
+REASON_OTHER = 0
+REASON_WIND = 1
+REASON_MECHANICAL = 2
+REASON_POWER = 3
+REASON_ICE = 4
+REASON_PATROL = 5
+
+REASON_NAMES = {
+    REASON_OTHER: "Other",
+    REASON_WIND: "Wind",
+    REASON_MECHANICAL: "Mechanical",
+    REASON_POWER: "Power",
+    REASON_ICE: "Ice",
+    REASON_PATROL: "Patrol",
+}
+
+# Checked in order and the first match wins, so anything mentioning wind stays a wind hold
+REASON_PATTERNS = [
+    (REASON_WIND, re.compile(r"wind|gust", re.IGNORECASE)),
+    (REASON_ICE, re.compile(r"\bic(?:e|ed|ing|y)\b|rime", re.IGNORECASE)),
+    (REASON_POWER, re.compile(r"power|electric|outage|generator", re.IGNORECASE)),
+    (REASON_MECHANICAL, re.compile(r"mechanic|drive|brake|gearbox|motor|bullwheel|sheave|repair|maint", re.IGNORECASE)),
+    (REASON_PATROL, re.compile(r"patrol|avalanche|avy\b|control work", re.IGNORECASE)),
+]
+
+# "Wind > 35mph", "Wind >= 35", "Wind over 35 mph" -> over; "Wind 20-25mph", "wind 20 to 25" -> low/high
+WIND_THRESHOLD_PATTERN = re.compile(
+    r"wind\D*?(?:(?P<low>\d+)\s*(?:-|–|to)\s*(?P<high>\d+)|(?:>=?|≥|over|above)\s*(?P<over>\d+))",
+    re.IGNORECASE,
+)
+
+# Numbers above this aren't wind limits (dates, typos) and are dropped rather than
+# wrapped around when stored as Int16
+MAX_WIND_MPH = 200
+
+WIND_MIN_COLUMN = "Wind Min (mph)"
+WIND_MAX_COLUMN = "Wind Max (mph)"
+
+# Distinct strings seen this season are few; this only guards against unbounded growth
+MAX_CACHE_SIZE = 10_000
+
+# Free text -> reason code, and fault text -> (wind min, wind max).
+# Shared by every session, so they are only read and updated under _cache_lock.
+_reason_cache = {}
+_threshold_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _lookup_memoized(values, cache, compute):
+    """
+    Result for each distinct string in values, as a dict
+    Strings not in the cache are passed (as a Series) to compute, which returns their
+    results in the same order; the work happens outside the lock
+    """
+    uniques = values.unique()
+    with _cache_lock:
+        known = {value: cache[value] for value in uniques if value in cache}
+    new = pd.Series([value for value in uniques if value not in known], dtype=object)
+    if len(new):
+        known.update(zip(new, compute(new)))
+        with _cache_lock:
+            if len(cache) + len(new) > MAX_CACHE_SIZE:
+                cache.clear()
+            cache.update(zip(new, (known[value] for value in new)))
+    return known
+
+
+def _reason_codes(reasons):
+    matches = [reasons.str.contains(pattern) for _, pattern in REASON_PATTERNS]
+    return np.select(matches, [code for code, _ in REASON_PATTERNS], default=REASON_OTHER).tolist()
+
+
+def _wind_limits(faults):
+    extracted = faults.str.extract(WIND_THRESHOLD_PATTERN)
+    low = pd.to_numeric(extracted["low"].fillna(extracted["over"]))
+    high = pd.to_numeric(extracted["high"])
+    low = low.where(low <= MAX_WIND_MPH).tolist()
+    high = high.where(high <= MAX_WIND_MPH).tolist()
+    return zip(low, high)
+
+
+def classify_reasons(reasons):
+    """Reason class code (int8) for each value of a free-text reason Series"""
+    values = reasons.fillna("").astype(str)
+    codes = _lookup_memoized(values, _reason_cache, _reason_codes)
+    return values.map(codes).astype("int8")
+
+
+def extract_wind_thresholds(faults):
+    """
+    Wind limits mentioned in each value of a free-text fault Series
+    Returns a DataFrame with nullable integer WIND_MIN_COLUMN and WIND_MAX_COLUMN
+    ("Wind > 35mph" gives min 35 and no max)
+    """
+    values = faults.fillna("").astype(str)
+    limits = _lookup_memoized(values, _threshold_cache, _wind_limits)
+    return pd.DataFrame({
+        WIND_MIN_COLUMN: values.map({value: low for value, (low, _) in limits.items()}).astype("Float64").astype("Int16"),
+        WIND_MAX_COLUMN: values.map({value: high for value, (_, high) in limits.items()}).astype("Float64").astype("Int16"),
+    }, index=faults.index)
+
+
+def add_reason_columns(df, reason_column="MEOW Reasoning", fault_column="Fault"):
+    """
+    Add "Reason Class" (code), "Reason" (class name) and the wind threshold columns to df
+    """
+    df["Reason Class"] = classify_reasons(df[reason_column])
+    df["Reason"] = df["Reason Class"].map(REASON_NAMES)
+    thresholds = extract_wind_thresholds(df[fault_column])
+    df[WIND_MIN_COLUMN] = thresholds[WIND_MIN_COLUMN]
+    df[WIND_MAX_COLUMN] = thresholds[WIND_MAX_COLUMN]
+    return df
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from google_credentials import find_credentials
+
 st.title("Simple Secrets Checker")
 
 # Check if we have any secrets
@@ -40,6 +42,13 @@ if hasattr(st, 'secrets'):
     if 'GOOGLE_SHEET_NAME' in st.secrets:
         st.success(f"Found GOOGLE_SHEET_NAME: {st.secrets.GOOGLE_SHEET_NAME}")
         
+    # Which credentials the dashboard will actually use (same lookup as merge_lift_wind_data)
+    lookup = find_credentials(st.secrets)
+    if lookup.info is not None:
+        st.success(f"Dashboard will use credentials from {lookup.source}")
+    else:
+        st.error(f"Dashboard can't use the credentials: {lookup.error}")
+        
 else:
     st.error("No secrets available")
     
@@ -0,0 +1,115 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hold_kpis import LIFT, VILLAGE, HoldKpiAggregator  # noqa: E402
+
+DAY = "2026-01-10"
+START = pd.Timestamp(f"{DAY} 08:00")
+
+
+def holds(*rows):
+    """Holds frame from (lift, start, resolved_at) rows"""
+    return pd.DataFrame({
+        "Lift": [lift for lift, _, _ in rows],
+        "Village": "Mountain Village",
+        "Reason": "Wind",
+        "10.60 TIME": pd.to_datetime([start for _, start, _ in rows]),
+        "Resolved At": pd.to_datetime([resolved_at for _, _, resolved_at in rows]),
+    }, columns=["Lift", "Village", "Reason", "10.60 TIME", "Resolved At"])
+
+
+def test_hold_is_resolved_at_its_10_63_time():
+    kpis = HoldKpiAggregator()
+    kpis.update(holds(("Eagle", START, None)), now=pd.Timestamp(f"{DAY} 09:00"))
+    # Dropping out of one snapshot doesn't count as being resolved then
+    kpis.update(holds(), now=pd.Timestamp(f"{DAY} 09:00:30"))
+    kpis.update(holds(("Eagle", START, f"{DAY} 10:00")), now=pd.Timestamp(f"{DAY} 10:00"))
+
+    summary = kpis.summary(LIFT, now=pd.Timestamp(f"{DAY} 11:00"))["Eagle"]
+    assert summary["open_count"] == 0
+    assert summary["closed_count"] == 1
+    assert summary["total_hours"] == 2.0
+    assert summary["starts_by_hour"] == {8: 1}
+    assert summary["longest_open_lift"] is None
+
+
+def test_reopened_hold_is_not_counted_twice():
+    kpis = HoldKpiAggregator()
+    kpis.update(holds(("Eagle", START, f"{DAY} 09:00")), now=pd.Timestamp(f"{DAY} 09:00"))
+    # 10.63 cleared again: the hold is open once more
+    kpis.update(holds(("Eagle", START, None)), now=pd.Timestamp(f"{DAY} 09:30"))
+
+    now = pd.Timestamp(f"{DAY} 10:00")
+    summary = kpis.summary(LIFT, now=now)["Eagle"]
+    assert summary["open_count"] == 1
+    assert summary["closed_count"] == 0
+    assert summary["total_hours"] == 2.0
+    assert summary["starts_by_hour"] == {8: 1}
+    assert summary["longest_open_lift"] == "Eagle"
+    assert summary["longest_open_hours"] == 2.0
+
+    kpis.update(holds(("Eagle", START, f"{DAY} 10:30")), now=pd.Timestamp(f"{DAY} 10:30"))
+    summary = kpis.summary(LIFT, now=pd.Timestamp(f"{DAY} 11:00"))["Eagle"]
+    assert summary["open_count"] == 0
+    assert summary["closed_count"] == 1
+    assert summary["total_hours"] == 2.5
+
+
+def test_fresh_aggregator_is_seeded_from_resolved_holds():
+    day = holds(
+        ("Eagle", START, f"{DAY} 09:00"),
+        ("Silverlode", f"{DAY} 08:30", f"{DAY} 10:00"),
+        ("Eagle", f"{DAY} 11:00", None),
+    )
+    now = pd.Timestamp(f"{DAY} 12:00")
+
+    # Two processes started at different times agree once they've seen the same rows
+    early = HoldKpiAggregator()
+    early.update(day.iloc[:1], now=pd.Timestamp(f"{DAY} 08:30"))
+    early.update(day, now=now)
+    restarted = HoldKpiAggregator()
+    restarted.update(day, now=now)
+
+    for kpis in (early, restarted):
+        summary = kpis.summary(VILLAGE, now=now)["Mountain Village"]
+        assert summary["open_count"] == 1
+        assert summary["closed_count"] == 2
+        assert summary["total_hours"] == 3.5
+        assert summary["starts_by_hour"] == {8: 2, 11: 1}
+
+
+def test_renamed_hold_replaces_the_old_entry():
+    kpis = HoldKpiAggregator()
+    kpis.update(holds(("Eagel", START, None)), now=pd.Timestamp(f"{DAY} 08:30"))
+    # Lift name corrected in the sheet, then the hold is resolved
+    kpis.update(holds(("Eagle", START, None)), now=pd.Timestamp(f"{DAY} 08:45"))
+    kpis.update(holds(("Eagle", START, f"{DAY} 09:00")), now=pd.Timestamp(f"{DAY} 09:00"))
+
+    now = pd.Timestamp(f"{DAY} 15:00")
+    lifts = kpis.summary(LIFT, now=now)
+    assert list(lifts) == ["Eagle"]
+    village = kpis.summary(VILLAGE, now=now)["Mountain Village"]
+    assert village["open_count"] == 0
+    assert village["closed_count"] == 1
+    assert village["total_hours"] == 1.0
+    assert village["starts_by_hour"] == {8: 1}
+    assert village["longest_open_lift"] is None
+
+    restarted = HoldKpiAggregator()
+    restarted.update(holds(("Eagle", START, f"{DAY} 09:00")), now=now)
+    assert restarted.summary(VILLAGE, now=now) == kpis.summary(VILLAGE, now=now)
+
+
+def test_deleted_hold_is_removed():
+    kpis = HoldKpiAggregator()
+    kpis.update(holds(("Eagle", START, None), ("Silverlode", f"{DAY} 09:00", f"{DAY} 09:30")),
+                now=pd.Timestamp(f"{DAY} 09:30"))
+    # Both rows were logged by mistake and deleted from the sheet
+    kpis.update(holds(), now=pd.Timestamp(f"{DAY} 10:00"))
+
+    assert kpis.summary(VILLAGE, now=pd.Timestamp(f"{DAY} 11:00")) == {}
+    assert kpis.summary(LIFT, now=pd.Timestamp(f"{DAY} 11:00")) == {}
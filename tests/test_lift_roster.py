@@ -0,0 +1,84 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lift_roster  # noqa: E402
+
+
+@pytest.fixture
+def messages(monkeypatch):
+    logged = []
+    monkeypatch.setattr(lift_roster, "debug_log", logged.append)
+    return logged
+
+
+@pytest.fixture
+def roster(messages):
+    return lift_roster.load_roster()
+
+
+def test_normalize_name():
+    assert lift_roster.normalize_name("McConkey's") == lift_roster.normalize_name("mcconkeys")
+    assert lift_roster.normalize_name("Red Pine Gondola") == "redpine"
+    # A name made only of filler words is kept rather than emptied
+    assert lift_roster.normalize_name("The Gondola") == "thegondola"
+
+
+def test_sheet_spellings_resolve(roster):
+    assert roster.resolve("McConkeys").name == "McConkey's"
+    assert roster.village("McConkeys") == "Mountain Village"
+    assert roster.lift_class("McConkeys") == lift_roster.UPPER_MOUNTAIN
+    assert roster.resolve("Red Pine").name == "Red Pine Gondola"
+    assert roster.lift_class("Red Pine") == lift_roster.FEEDER
+    # Close misspelling
+    assert roster.resolve("Silverlod").name == "Silverlode"
+
+
+def test_ambiguous_near_miss_is_unknown(messages):
+    roster = lift_roster.compile_roster({"villages": {"Canyons Village": {"Timberline": None, "Timberlane": None}}})
+    assert roster.resolve("Timberlyne") is None
+    assert roster.village("Timberlyne") == lift_roster.UNKNOWN_VILLAGE
+
+
+def test_unknown_name_is_logged_once(roster, messages):
+    for _ in range(3):
+        assert roster.village("Test Lift") == lift_roster.UNKNOWN_VILLAGE
+    assert roster.lift_class("Test Lift") is None
+    assert [message for message in messages if "Test Lift" in message] == [
+        "Lift 'Test Lift' is not in the lift roster; showing it as Unknown"
+    ]
+
+
+def test_conflicting_aliases_are_rejected():
+    with pytest.raises(ValueError):
+        lift_roster.compile_roster({"villages": {
+            "Mountain Village": {"Eagle": {"aliases": ["Big Bird"]}},
+            "Canyons Village": {"Condor": {"aliases": ["Big-Bird"]}},
+        }})
+    with pytest.raises(ValueError):
+        lift_roster.compile_roster({"villages": {"Mountain Village": {"Eagle": {"class": "beginner"}}}})
+
+
+def test_roster_reloads_when_the_file_changes(tmp_path, monkeypatch, messages):
+    path = tmp_path / "lift_roster.yaml"
+    monkeypatch.setattr(lift_roster, "ROSTER_PATH", str(path))
+    monkeypatch.setattr(lift_roster, "RELOAD_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(lift_roster, "_state", {"roster": None, "mtime": None, "checked_at": 0.0})
+
+    def write(text, mtime):
+        path.write_text(text)
+        os.utime(path, (mtime, mtime))
+
+    write("villages:\n  Mountain Village:\n    Eagle:\n", 1_000_000)
+    assert lift_roster.get_roster().village("Eagle") == "Mountain Village"
+
+    write("villages:\n  Canyons Village:\n    Eagle:\n", 1_000_100)
+    assert lift_roster.get_roster().village("Eagle") == "Canyons Village"
+
+    # A broken edit keeps the previous roster until it is fixed
+    write("villages: [unclosed\n", 1_000_200)
+    assert lift_roster.get_roster().village("Eagle") == "Canyons Village"
+    assert any("Error reloading lift roster" in message for message in messages)
@@ -0,0 +1,68 @@
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lift_snapshot  # noqa: E402
+import merge_lift_wind_data  # noqa: E402
+
+
+class FakeSheet:
+    def __init__(self, records):
+        self.records = records
+
+    def get_all_records(self):
+        return self.records
+
+
+def record(lift, category, reason, start, resolved="", fault=""):
+    today = datetime.today().strftime("%Y-%m-%d")
+    return {"Lift": lift, "MEOW Category": category, "MEOW Reasoning": reason,
+            "10.60 TIME": f"{today} {start}", "10.63": resolved, "Fault": fault}
+
+
+def fetch_forecasts():
+    return {
+        "MV Wind Forecast": (pd.DataFrame([
+            {"Hour": "08:00 AM", "Wind Speed (mph)": 12, "Wind Gust (mph)": None, "Wind Direction": "NW"},
+            {"Hour": "09:00 AM", "Wind Speed (mph)": 15, "Wind Gust (mph)": None, "Wind Direction": "NW"},
+        ]), "Increasing"),
+        # No forecast periods returned for this grid point
+        "CV Wind Forecast": (pd.DataFrame([]), "N/A"),
+    }
+
+
+@pytest.fixture
+def sheet(monkeypatch):
+    monkeypatch.setattr(merge_lift_wind_data, "debug_log", lambda message: None)
+    monkeypatch.setattr(lift_snapshot, "debug_log", lambda message: None)
+    monkeypatch.setattr(lift_snapshot, "_loaded", {"seq": None, "data": None})
+    monkeypatch.setattr(merge_lift_wind_data, "_sheet", FakeSheet([
+        record("Eagle", "Hold", "High wind", "08:00:00", fault="Wind > 35mph"),
+        record("Silverlode", "Hold", "Drive fault", "08:30:00", fault=7),
+        record("Bonanza", "Reduced/Adjust Speed", "Wind", "09:00:00"),
+        record("Payday", "Hold", "Wind", "07:30:00", resolved="08:15"),
+    ]))
+
+
+def test_snapshot_matches_in_process_data(sheet, tmp_path):
+    in_process = lift_snapshot.load_snapshot(merge_lift_wind_data.get_lift_data, fetch_forecasts, directory=None)
+    shared = lift_snapshot.load_snapshot(merge_lift_wind_data.get_lift_data, fetch_forecasts,
+                                         directory=str(tmp_path))
+
+    # Lift frames come back with string columns, so compare values rather than dtypes
+    for expected, actual in zip(in_process[:4], shared[:4]):
+        columns = ["Lift", "MEOW Category", "10.60 TIME", "Reason"]
+        pd.testing.assert_frame_equal(actual[columns], expected[columns], check_dtype=False)
+    pd.testing.assert_series_equal(shared[3]["Resolved At"], in_process[3]["Resolved At"], check_dtype=False)
+
+    expected_forecasts, forecasts = in_process[4], shared[4]
+    assert list(forecasts) == list(expected_forecasts)
+    for name, (expected_df, expected_trend) in expected_forecasts.items():
+        wind_df, trend = forecasts[name]
+        assert trend == expected_trend
+        pd.testing.assert_frame_equal(wind_df, expected_df)
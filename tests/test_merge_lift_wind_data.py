@@ -0,0 +1,51 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import merge_lift_wind_data  # noqa: E402
+
+
+class FakeSheet:
+    def __init__(self, records):
+        self.records = records
+
+    def get_all_records(self):
+        return self.records
+
+
+def hold(lift, start, resolved=""):
+    today = datetime.today().strftime("%Y-%m-%d")
+    return {"Lift": lift, "MEOW Category": "Hold", "MEOW Reasoning": "High wind",
+            "10.60 TIME": f"{today} {start}", "10.63": resolved, "Fault": "Wind > 35mph"}
+
+
+@pytest.fixture
+def sheet(monkeypatch):
+    monkeypatch.setattr(merge_lift_wind_data, "debug_log", lambda message: None)
+
+    def use(records):
+        monkeypatch.setattr(merge_lift_wind_data, "_sheet", FakeSheet(records))
+    return use
+
+
+def test_blank_10_63_is_open_in_tables_and_kpis(sheet):
+    sheet([hold("Eagle", "08:00:00", "   "), hold("Silverlode", "08:30:00", "09:15"),
+           hold("Bonanza", "09:00:00", "see notes")])
+    all_lifts, wind_hold, other_hold, holds_today = merge_lift_wind_data.get_lift_data()
+
+    assert list(wind_hold["Lift"]) == ["Eagle"]
+    resolved = holds_today.set_index("Lift")["Resolved At"]
+    assert resolved.isna().tolist() == [True, False, False]
+    assert resolved["Silverlode"].strftime("%H:%M") == "09:15"
+    # Unreadable 10.63 entries count as resolved when the hold started
+    assert resolved["Bonanza"].strftime("%H:%M") == "09:00"
+
+
+def test_unreadable_sheet_raises(sheet):
+    sheet([{"Lift": "Eagle"}])
+    with pytest.raises(merge_lift_wind_data.LiftDataError):
+        merge_lift_wind_data.get_lift_data()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reason_classifier import (  # noqa: E402
+    REASON_MECHANICAL, REASON_OTHER, REASON_WIND, WIND_MAX_COLUMN, WIND_MIN_COLUMN, classify_reasons,
+    extract_wind_thresholds,
+)
+
+
+def test_classify_reasons():
+    reasons = pd.Series(["High wind", "Brake fault", None, "Medical"])
+    assert classify_reasons(reasons).tolist() == [REASON_WIND, REASON_MECHANICAL, REASON_OTHER, REASON_OTHER]
+
+
+def test_extract_wind_thresholds():
+    thresholds = extract_wind_thresholds(pd.Series(["Wind > 35mph", "Wind 20-25mph", "Drive fault", None]))
+    assert thresholds[WIND_MIN_COLUMN].tolist() == [35, 20, pd.NA, pd.NA]
+    assert thresholds[WIND_MAX_COLUMN].tolist() == [pd.NA, 25, pd.NA, pd.NA]
+
+
+def test_out_of_range_wind_limits_are_dropped():
+    thresholds = extract_wind_thresholds(pd.Series(["Wind > 40000mph", "Wind on 20250228 - 3"]))
+    assert thresholds[WIND_MIN_COLUMN].isna().all()
+    assert thresholds[WIND_MAX_COLUMN].tolist() == [pd.NA, 3]